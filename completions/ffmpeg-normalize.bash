@@ -15,6 +15,8 @@ _ffmpeg_normalize()
           -q --quiet \
           -n --dry-run \
           -pr --progress \
+          -j --jobs \
+          --cache \
           --version \
           -nt --normalization-type \
           -t --target-level \
@@ -28,6 +30,7 @@ _ffmpeg_normalize()
           --lower-only \
           --dual-mono \
           --dynamic \
+          --single-pass \
           -c:a --audio-codec \
           -b:a --audio-bitrate \
           -ar --sample-rate \
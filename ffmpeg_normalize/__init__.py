@@ -1,9 +1,17 @@
+from __future__ import annotations
+
+import importlib as _importlib
+from typing import TYPE_CHECKING as _TYPE_CHECKING
+from typing import Any as _Any
+
 from ._errors import FFmpegNormalizeError
-from ._ffmpeg_normalize import FFmpegNormalize
-from ._media_file import MediaFile
-from ._streams import AudioStream, MediaStream, SubtitleStream, VideoStream
 from ._version import __version__
 
+if _TYPE_CHECKING:
+    from ._ffmpeg_normalize import FFmpegNormalize
+    from ._media_file import MediaFile
+    from ._streams import AudioStream, MediaStream, SubtitleStream, VideoStream
+
 __module_name__ = "ffmpeg_normalize"
 
 __all__ = [
@@ -16,3 +24,21 @@ __all__ = [
     "MediaStream",
     "__version__",
 ]
+
+# these pull in tqdm and ffmpeg-progress-yield, so they are only imported on
+# first access, which keeps the CLI fast for --help and usage errors
+_lazy_imports = {
+    "FFmpegNormalize": "._ffmpeg_normalize",
+    "MediaFile": "._media_file",
+    "AudioStream": "._streams",
+    "VideoStream": "._streams",
+    "SubtitleStream": "._streams",
+    "MediaStream": "._streams",
+}
+
+
+def __getattr__(name: str) -> _Any:
+    if name in _lazy_imports:
+        module = _importlib.import_module(_lazy_imports[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,19 +5,53 @@ import json
 import logging
 import os
 import shlex
+import stat
 import sys
 import textwrap
+from itertools import zip_longest
 from json.decoder import JSONDecodeError
 from typing import NoReturn
 
+from ._constants import NORMALIZATION_TYPES
 from ._errors import FFmpegNormalizeError
-from ._ffmpeg_normalize import NORMALIZATION_TYPES, FFmpegNormalize
-from ._logger import setup_cli_logger
 from ._version import __version__
 
 _logger = logging.getLogger(__name__)
 
 
+def _split_options(opts: str) -> tuple[str, ...]:
+    """
+    Parse extra options (input or output) into a tuple.
+
+    Args:
+        opts: String of options
+
+    Returns:
+        tuple: Tuple of options
+
+    Raises:
+        argparse.ArgumentTypeError: If the options cannot be parsed
+    """
+    opts = opts.strip()
+    if not opts:
+        return ()
+    is_json = opts.startswith("[") and opts.endswith("]")
+    # without quotes or escapes, shlex would only split on whitespace
+    if not is_json and not any(c in opts for c in "\"'\\"):
+        return tuple(opts.split())
+    if is_json:
+        try:
+            return tuple(str(s) for s in json.loads(opts))
+        except JSONDecodeError:
+            pass
+    try:
+        return tuple(shlex.split(opts))
+    except Exception as e:
+        raise argparse.ArgumentTypeError(
+            f"Could not parse extra_options: {e}"
+        ) from e
+
+
 def create_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="ffmpeg-normalize",
@@ -109,6 +143,34 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Show progress bar for files and streams",
     )
+    group_general.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help=textwrap.dedent(
+            """\
+        Number of files to normalize in parallel (default: 1).
+
+        Each job runs its own ffmpeg process, so setting this to the number of
+        CPU cores is usually a good choice for large batches.
+        """
+        ),
+        default=1,
+    )
+    group_general.add_argument(
+        "--cache",
+        action="store_true",
+        help=textwrap.dedent(
+            """\
+        Cache first pass statistics and reuse them on subsequent runs.
+
+        Statistics are stored in $XDG_CACHE_HOME/ffmpeg-normalize (or
+        ~/.cache/ffmpeg-normalize) and are only reused if the input file
+        (path, size, modification time) and all settings that influence the
+        measurement are unchanged.
+        """
+        ),
+    )
     group_general.add_argument(
         "--version",
         action="version",
@@ -292,6 +354,21 @@ def create_parser() -> argparse.ArgumentParser:
         ),
     )
 
+    group_ebu.add_argument(
+        "--single-pass",
+        action="store_true",
+        help=textwrap.dedent(
+            """\
+        Skip the first (measurement) pass and normalize in a single pass.
+
+        This reads and decodes every input only once, but the loudnorm filter
+        can then only normalize dynamically, since it has no measured values to
+        compute a linear gain from. Implies --dynamic, and cannot be combined
+        with options that rely on first pass statistics, such as --lower-only.
+        """
+        ),
+    )
+
     group_acodec = parser.add_argument_group("Audio Encoding")
     group_acodec.add_argument(
         "-c:a",
@@ -417,7 +494,7 @@ def create_parser() -> argparse.ArgumentParser:
     group_format.add_argument(
         "-ei",
         "--extra-input-options",
-        type=str,
+        type=_split_options,
         help=textwrap.dedent(
             """\
         Extra input options list.
@@ -441,7 +518,7 @@ def create_parser() -> argparse.ArgumentParser:
     group_format.add_argument(
         "-e",
         "--extra-output-options",
-        type=str,
+        type=_split_options,
         help=textwrap.dedent(
             """\
         Extra output options list.
@@ -492,7 +569,18 @@ def create_parser() -> argparse.ArgumentParser:
 
 
 def main() -> None:
+    # answer the most common trivial invocation without building the parser
+    if sys.argv[1:] == ["--version"]:
+        print(f"ffmpeg-normalize v{__version__}")
+        return
+
     cli_args = create_parser().parse_args()
+
+    # imported here so that --help, --version and usage errors do not pay for
+    # colorlog, tqdm and ffmpeg-progress-yield
+    from ._ffmpeg_normalize import FFmpegNormalize
+    from ._logger import setup_cli_logger
+
     setup_cli_logger(arguments=cli_args)
 
     def error(message: object) -> NoReturn:
@@ -502,66 +590,48 @@ def main() -> None:
             _logger.error(message)
         sys.exit(1)
 
-    def _split_options(opts: str) -> list[str]:
-        """
-        Parse extra options (input or output) into a list.
+    # extra options are split by argparse, see _split_options
+    extra_input_options = list(cli_args.extra_input_options or ())
+    extra_output_options = list(cli_args.extra_output_options or ())
 
-        Args:
-            opts: String of options
-
-        Returns:
-            list: List of options
-        """
-        if not opts:
-            return []
-        try:
-            if opts.startswith("["):
-                try:
-                    ret = [str(s) for s in json.loads(opts)]
-                except JSONDecodeError:
-                    ret = shlex.split(opts)
-            else:
-                ret = shlex.split(opts)
-        except Exception as e:
-            error(f"Could not parse extra_options: {e}")
-        return ret
-
-    # parse extra options
-    extra_input_options = _split_options(cli_args.extra_input_options)
-    extra_output_options = _split_options(cli_args.extra_output_options)
-
-    ffmpeg_normalize = FFmpegNormalize(
-        normalization_type=cli_args.normalization_type,
-        target_level=cli_args.target_level,
-        print_stats=cli_args.print_stats,
-        loudness_range_target=cli_args.loudness_range_target,
-        # threshold=cli_args.threshold,
-        keep_loudness_range_target=cli_args.keep_loudness_range_target,
-        keep_lra_above_loudness_range_target=cli_args.keep_lra_above_loudness_range_target,
-        true_peak=cli_args.true_peak,
-        offset=cli_args.offset,
-        lower_only=cli_args.lower_only,
-        auto_lower_loudness_target=cli_args.auto_lower_loudness_target,
-        dual_mono=cli_args.dual_mono,
-        dynamic=cli_args.dynamic,
-        audio_codec=cli_args.audio_codec,
-        audio_bitrate=cli_args.audio_bitrate,
-        sample_rate=cli_args.sample_rate,
-        audio_channels=cli_args.audio_channels,
-        keep_original_audio=cli_args.keep_original_audio,
-        pre_filter=cli_args.pre_filter,
-        post_filter=cli_args.post_filter,
-        video_codec=cli_args.video_codec,
-        video_disable=cli_args.video_disable,
-        subtitle_disable=cli_args.subtitle_disable,
-        metadata_disable=cli_args.metadata_disable,
-        chapters_disable=cli_args.chapters_disable,
-        extra_input_options=extra_input_options,
-        extra_output_options=extra_output_options,
-        output_format=cli_args.output_format,
-        dry_run=cli_args.dry_run,
-        progress=cli_args.progress,
-    )
+    try:
+        ffmpeg_normalize = FFmpegNormalize(
+            normalization_type=cli_args.normalization_type,
+            target_level=cli_args.target_level,
+            print_stats=cli_args.print_stats,
+            loudness_range_target=cli_args.loudness_range_target,
+            # threshold=cli_args.threshold,
+            keep_loudness_range_target=cli_args.keep_loudness_range_target,
+            keep_lra_above_loudness_range_target=cli_args.keep_lra_above_loudness_range_target,
+            true_peak=cli_args.true_peak,
+            offset=cli_args.offset,
+            lower_only=cli_args.lower_only,
+            auto_lower_loudness_target=cli_args.auto_lower_loudness_target,
+            dual_mono=cli_args.dual_mono,
+            dynamic=cli_args.dynamic,
+            single_pass=cli_args.single_pass,
+            audio_codec=cli_args.audio_codec,
+            audio_bitrate=cli_args.audio_bitrate,
+            sample_rate=cli_args.sample_rate,
+            audio_channels=cli_args.audio_channels,
+            keep_original_audio=cli_args.keep_original_audio,
+            pre_filter=cli_args.pre_filter,
+            post_filter=cli_args.post_filter,
+            video_codec=cli_args.video_codec,
+            video_disable=cli_args.video_disable,
+            subtitle_disable=cli_args.subtitle_disable,
+            metadata_disable=cli_args.metadata_disable,
+            chapters_disable=cli_args.chapters_disable,
+            extra_input_options=extra_input_options,
+            extra_output_options=extra_output_options,
+            output_format=cli_args.output_format,
+            dry_run=cli_args.dry_run,
+            progress=cli_args.progress,
+            jobs=cli_args.jobs,
+            cache=cli_args.cache,
+        )
+    except FFmpegNormalizeError as e:
+        error(e)
 
     if cli_args.output and len(cli_args.input) > len(cli_args.output):
         _logger.warning(
@@ -570,29 +640,37 @@ def main() -> None:
             "Will apply default file naming for the remaining ones."
         )
 
-    for index, input_file in enumerate(cli_args.input):
-        if cli_args.output is not None and index < len(cli_args.output):
+    # create the default output folder once, if any input file needs it
+    if (
+        (cli_args.output is None or len(cli_args.input) > len(cli_args.output))
+        and not os.path.isdir(cli_args.output_folder)
+        and not cli_args.dry_run
+    ):
+        _logger.warning(
+            f"Output directory '{cli_args.output_folder}' does not exist, will create"
+        )
+        os.makedirs(cli_args.output_folder, exist_ok=True)
+
+    # first decide which files to process, then add them all at once
+    media_files: list[tuple[str, str]] = []
+    seen_files: set[tuple[int, int, str]] = set()
+    # surplus output file names have no input file and are ignored
+    output_files = (cli_args.output or [])[: len(cli_args.input)]
+    for input_file, output_file in zip_longest(cli_args.input, output_files):
+        if output_file is not None:
             if cli_args.output_folder and cli_args.output_folder != "normalized":
                 _logger.warning(
                     f"Output folder {cli_args.output_folder} is ignored for "
                     f"input file {input_file}"
                 )
-            output_file = cli_args.output[index]
             output_dir = os.path.dirname(output_file)
             if output_dir != "" and not os.path.isdir(output_dir):
                 error(f"Output file path {output_dir} does not exist")
         else:
+            stem = os.path.splitext(os.path.basename(input_file))[0]
             output_file = os.path.join(
-                cli_args.output_folder,
-                os.path.splitext(os.path.basename(input_file))[0]
-                + "."
-                + cli_args.extension,
+                cli_args.output_folder, f"{stem}.{cli_args.extension}"
             )
-            if not os.path.isdir(cli_args.output_folder) and not cli_args.dry_run:
-                _logger.warning(
-                    f"Output directory '{cli_args.output_folder}' does not exist, will create"
-                )
-                os.makedirs(cli_args.output_folder, exist_ok=True)
 
         if os.path.exists(output_file) and not cli_args.force:
             _logger.warning(
@@ -600,18 +678,30 @@ def main() -> None:
             )
             continue
 
-        if not os.path.exists(input_file):
+        try:
+            input_stat = os.stat(input_file)
+        except OSError:
             _logger.warning(f"Input file '{input_file}' does not exist, skipping")
             continue
 
-        if not os.path.isfile(input_file):
+        if not stat.S_ISREG(input_stat.st_mode):
             _logger.warning(f"Input file '{input_file}' is not a file, skipping")
             continue
 
-        try:
-            ffmpeg_normalize.add_media_file(input_file, output_file)
-        except FFmpegNormalizeError as e:
-            error(e)
+        # the same file may be given more than once, e.g. via symlinks or overlapping globs
+        file_key = (input_stat.st_dev, input_stat.st_ino, os.path.abspath(output_file))
+        if file_key in seen_files:
+            _logger.warning(
+                f"Input file '{input_file}' was already given for output file '{output_file}', skipping"
+            )
+            continue
+        seen_files.add(file_key)
+        media_files.append((input_file, output_file))
+
+    try:
+        ffmpeg_normalize.add_media_files(media_files)
+    except FFmpegNormalizeError as e:
+        error(e)
 
     try:
         ffmpeg_normalize.run_normalization()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Iterable
+
+_logger = logging.getLogger(__name__)
+
+# bump this whenever the format of the cached statistics changes
+CACHE_VERSION = 1
+
+
+def get_cache_dir() -> str:
+    """
+    Return the directory used to cache first pass statistics, which is
+    $XDG_CACHE_HOME/ffmpeg-normalize, or ~/.cache/ffmpeg-normalize if unset.
+
+    Returns:
+        str: Path to the cache directory
+    """
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "ffmpeg-normalize")
+
+
+def get_cache_key(
+    input_file: str, *params: str, depends_on: Iterable[str] = ()
+) -> str | None:
+    """
+    Compute a cache key for an input file and everything its statistics depend on.
+
+    Args:
+        input_file (str): Path to the input file
+        *params (str): Other values that influence the statistics, e.g. the filter graph
+        depends_on (Iterable[str], optional): Paths of other files that influence the
+            statistics, e.g. the ffmpeg executable. Like the input file, they are
+            identified by path, size and modification time.
+
+    Returns:
+        str | None: The cache key, or None if one of the files cannot be accessed
+    """
+    file_data = []
+    for path in (input_file, *depends_on):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        file_data.extend([os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+
+    key_data = json.dumps([CACHE_VERSION, *file_data, *params])
+    return hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+
+
+def load_cached_stats(key: str) -> Any | None:
+    """
+    Load cached statistics.
+
+    Args:
+        key (str): The cache key
+
+    Returns:
+        Any | None: The cached statistics, or None if there are none
+    """
+    cache_file = os.path.join(get_cache_dir(), f"{key}.json")
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        _logger.warning(f"Could not read cached statistics from {cache_file}: {e}")
+        return None
+
+
+def save_cached_stats(key: str, stats: Any) -> None:
+    """
+    Save statistics to the cache. Failing to do so is not an error.
+
+    Args:
+        key (str): The cache key
+        stats (Any): The statistics, which must be JSON-serializable
+    """
+    cache_dir = get_cache_dir()
+    temp_file = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_file = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(stats, f)
+        # replace atomically, so that concurrent runs never read partial files
+        os.replace(temp_file, os.path.join(cache_dir, f"{key}.json"))
+    except OSError as e:
+        _logger.warning(f"Could not write statistics to cache in {cache_dir}: {e}")
+        if temp_file is not None and os.path.exists(temp_file):
+            os.remove(temp_file)
@@ -5,7 +5,7 @@ import os
 import re
 import shlex
 import subprocess
-from platform import system
+from functools import lru_cache
 from shutil import which
 from typing import Iterator, Any
 
@@ -15,11 +15,14 @@ from ._errors import FFmpegNormalizeError
 
 _logger = logging.getLogger(__name__)
 
-NUL = "NUL" if system() in ("Windows", "cli") else "/dev/null"
 DUR_REGEX = re.compile(
     r"Duration: (?P<hour>\d{2}):(?P<min>\d{2}):(?P<sec>\d{2})\.(?P<ms>\d{2})"
 )
 
+_progress_line_pattern = re.compile(
+    r"bitrate=|total_size=|out_time(?:_us|_ms)?=|dup_frames=|drop_frames=|speed=|progress="
+)
+
 
 class CommandRunner:
     """
@@ -48,24 +51,9 @@ class CommandRunner:
             str: Output with progress lines removed
         """
         return "\n".join(
-            [
-                line
-                for line in output.splitlines()
-                if not any(
-                    key in line
-                    for key in [
-                        "bitrate=",
-                        "total_size=",
-                        "out_time_us=",
-                        "out_time_ms=",
-                        "out_time=",
-                        "dup_frames=",
-                        "drop_frames=",
-                        "speed=",
-                        "progress=",
-                    ]
-                )
-            ]
+            line
+            for line in output.splitlines()
+            if not _progress_line_pattern.search(line)
         )
 
     def run_ffmpeg_command(self, cmd: list[str]) -> Iterator[float]:
@@ -76,13 +64,14 @@ class CommandRunner:
             float: Progress percentage
         """
         # wrapper for 'ffmpeg-progress-yield'
-        _logger.debug(f"Running command: {shlex.join(cmd)}")
+        if _logger.isEnabledFor(logging.DEBUG):
+            _logger.debug(f"Running command: {shlex.join(cmd)}")
         ff = FfmpegProgress(cmd, dry_run=self.dry)
         yield from ff.run_command_with_progress()
 
         self.output = ff.stderr
 
-        if _logger.getEffectiveLevel() == logging.DEBUG and self.output is not None:
+        if _logger.isEnabledFor(logging.DEBUG) and self.output is not None:
             _logger.debug(
                 f"ffmpeg output: {CommandRunner.prune_ffmpeg_progress_from_output(self.output)}"
             )
@@ -97,29 +86,26 @@ class CommandRunner:
         Raises:
             RuntimeError: If command returns non-zero exit code
         """
-        _logger.debug(f"Running command: {shlex.join(cmd)}")
+        if _logger.isEnabledFor(logging.DEBUG):
+            _logger.debug(f"Running command: {shlex.join(cmd)}")
 
         if self.dry:
             _logger.debug("Dry mode specified, not actually running command")
             return self
 
-        p = subprocess.Popen(
+        p = subprocess.run(
             cmd,
             stdin=subprocess.PIPE,  # Apply stdin isolation by creating separate pipe.
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            universal_newlines=False,
+            capture_output=True,
+            encoding="utf-8",
+            errors="replace",
+            check=False,
         )
 
-        stdout_bytes, stderr_bytes = p.communicate()
-
-        stdout = stdout_bytes.decode("utf8", errors="replace")
-        stderr = stderr_bytes.decode("utf8", errors="replace")
-
         if p.returncode != 0:
-            raise RuntimeError(f"Error running command {shlex.join(cmd)}: {stderr}")
+            raise RuntimeError(f"Error running command {shlex.join(cmd)}: {p.stderr}")
 
-        self.output = stdout + stderr
+        self.output = p.stdout + p.stderr
         return self
 
     def get_output(self) -> str:
@@ -138,15 +124,14 @@ def dict_to_filter_opts(opts: dict[str, Any]) -> str:
     Returns:
         str: Filter option string
     """
-    filter_opts = []
-    for k, v in opts.items():
-        filter_opts.append(f"{k}={v}")
-    return ":".join(filter_opts)
+    return ":".join(f"{k}={v}" for k, v in opts.items())
 
 
+@lru_cache(maxsize=None)
 def get_ffmpeg_exe() -> str:
     """
-    Return path to ffmpeg executable
+    Return path to ffmpeg executable. The result is cached, so $PATH and
+    $FFMPEG_PATH are only looked up once per process.
 
     Returns:
         str: Path to ffmpeg executable
@@ -177,9 +162,11 @@ def get_ffmpeg_exe() -> str:
     return ff_path
 
 
+@lru_cache(maxsize=None)
 def ffmpeg_has_loudnorm() -> bool:
     """
     Run feature detection on ffmpeg to see if it supports the loudnorm filter.
+    The result is cached, so ffmpeg is only queried once per process.
 
     Returns:
         bool: True if loudnorm is supported, False otherwise
@@ -0,0 +1,3 @@
+# kept free of dependencies, so that the CLI can use these before importing
+# the rest of the package
+NORMALIZATION_TYPES = ("ebu", "rms", "peak")
@@ -4,12 +4,15 @@ import json
 import logging
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from itertools import chain
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Iterable, Literal
 
 from tqdm import tqdm
 
 from ._cmd_utils import ffmpeg_has_loudnorm, get_ffmpeg_exe
+from ._constants import NORMALIZATION_TYPES
 from ._errors import FFmpegNormalizeError
 from ._media_file import MediaFile
 
@@ -18,7 +21,6 @@ if TYPE_CHECKING:
 
 _logger = logging.getLogger(__name__)
 
-NORMALIZATION_TYPES = ("ebu", "rms", "peak")
 PCM_INCOMPATIBLE_FORMATS = {"flac", "mp3", "mp4", "ogg", "oga", "opus", "webm"}
 PCM_INCOMPATIBLE_EXTS = {"flac", "mp3", "mp4", "m4a", "ogg", "oga", "opus", "webm"}
 
@@ -64,6 +66,7 @@ class FFmpegNormalize:
         auto_lower_loudness_target (bool, optional): Automatically lower EBU Integrated Loudness Target.
         dual_mono (bool, optional): Dual mono. Defaults to False.
         dynamic (bool, optional): Dynamic. Defaults to False.
+        single_pass (bool, optional): Skip the first pass and normalize dynamically with loudnorm in one pass. Defaults to False.
         audio_codec (str, optional): Audio codec. Defaults to "pcm_s16le".
         audio_bitrate (float, optional): Audio bitrate. Defaults to None.
         sample_rate (int, optional): Sample rate. Defaults to None.
@@ -82,6 +85,8 @@ class FFmpegNormalize:
         dry_run (bool, optional): Dry run. Defaults to False.
         debug (bool, optional): Debug. Defaults to False.
         progress (bool, optional): Progress. Defaults to False.
+        jobs (int, optional): Number of files to normalize in parallel. Defaults to 1.
+        cache (bool, optional): Cache first pass statistics on disk and reuse them for unchanged input files. Defaults to False.
 
     Raises:
         FFmpegNormalizeError: If the ffmpeg executable is not found or does not support the loudnorm filter.
@@ -102,6 +107,7 @@ class FFmpegNormalize:
         auto_lower_loudness_target: bool = False,
         dual_mono: bool = False,
         dynamic: bool = False,
+        single_pass: bool = False,
         audio_codec: str = "pcm_s16le",
         audio_bitrate: float | None = None,
         sample_rate: float | int | None = None,
@@ -120,6 +126,8 @@ class FFmpegNormalize:
         dry_run: bool = False,
         debug: bool = False,
         progress: bool = False,
+        jobs: int = 1,
+        cache: bool = False,
     ):
         self.ffmpeg_exe = get_ffmpeg_exe()
         self.has_loudnorm_capabilities = ffmpeg_has_loudnorm()
@@ -179,6 +187,12 @@ class FFmpegNormalize:
 
         self.dual_mono = dual_mono
         self.dynamic = dynamic
+        self.single_pass = single_pass
+
+        if self.single_pass:
+            self._check_single_pass()
+            # without measured values, loudnorm can only normalize dynamically
+            self.dynamic = True
         self.sample_rate = None if sample_rate is None else int(sample_rate)
         self.audio_channels = None if audio_channels is None else int(audio_channels)
 
@@ -201,6 +215,11 @@ class FFmpegNormalize:
         self.debug = debug
         self.progress = progress
 
+        if not isinstance(jobs, int) or jobs < 1:
+            raise FFmpegNormalizeError("jobs must be a positive integer")
+        self.jobs = jobs
+        self.cache = cache
+
         if (
             self.audio_codec is None or "pcm" in self.audio_codec
         ) and self.output_format in PCM_INCOMPATIBLE_FORMATS:
@@ -211,7 +230,41 @@ class FFmpegNormalize:
 
         self.stats: list[LoudnessStatisticsWithMetadata] = []
         self.media_files: list[MediaFile] = []
-        self.file_count = 0
+        # set when the batch is aborted, e.g. by Ctrl-C, so that running jobs
+        # do not treat their killed ffmpeg as an ordinary per-file error
+        self._interrupted = threading.Event()
+
+    def _check_single_pass(self) -> None:
+        """
+        Check that single pass normalization can be used with the other settings.
+
+        Raises:
+            FFmpegNormalizeError: If the normalization type or an option requires a first pass
+        """
+        if self.normalization_type != "ebu":
+            raise FFmpegNormalizeError(
+                "Single pass normalization is only supported for EBU normalization"
+            )
+        if (
+            self.lower_only
+            or self.auto_lower_loudness_target
+            or self.keep_loudness_range_target
+            or self.keep_lra_above_loudness_range_target
+        ):
+            raise FFmpegNormalizeError(
+                "Single pass normalization cannot be combined with options that require first pass statistics "
+                "(--lower-only, --auto-lower-loudness-target, --keep-loudness-range-target, --keep-lra-above-loudness-range-target)"
+            )
+
+    @property
+    def file_count(self) -> int:
+        """
+        Number of media files added for normalization.
+
+        Returns:
+            int: Number of media files
+        """
+        return len(self.media_files)
 
     def add_media_file(self, input_file: str, output_file: str) -> None:
         """
@@ -221,6 +274,46 @@ class FFmpegNormalize:
             input_file (str): Path to input file
             output_file (str): Path to output file
         """
+        self.media_files.append(self._create_media_file(input_file, output_file))
+
+    def add_media_files(self, files: Iterable[tuple[str, str]]) -> None:
+        """
+        Add several media files to normalize, keeping their order. With more
+        than one job, the files are probed in parallel.
+
+        Args:
+            files (Iterable[tuple[str, str]]): Pairs of input and output file paths
+        """
+        file_list = list(files)
+        if self.jobs > 1 and len(file_list) > 1:
+            # probing runs an ffmpeg subprocess per file, so threads are enough
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                try:
+                    media_files = list(
+                        executor.map(lambda f: self._create_media_file(*f), file_list)
+                    )
+                except BaseException:
+                    # do not start probing the remaining files
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise
+        else:
+            media_files = [self._create_media_file(*f) for f in file_list]
+        self.media_files.extend(media_files)
+
+    def _create_media_file(self, input_file: str, output_file: str) -> MediaFile:
+        """
+        Check the input and output file and create a media file from them
+
+        Args:
+            input_file (str): Path to input file
+            output_file (str): Path to output file
+
+        Returns:
+            MediaFile: The media file
+
+        Raises:
+            FFmpegNormalizeError: If the input file does not exist or the output extension does not fit the codec
+        """
         if not os.path.exists(input_file):
             raise FFmpegNormalizeError(f"file {input_file} does not exist")
 
@@ -233,34 +326,71 @@ class FFmpegNormalize:
                 "Please choose a suitable audio codec with the -c:a option."
             )
 
-        self.media_files.append(MediaFile(self, input_file, output_file))
-        self.file_count += 1
+        return MediaFile(self, input_file, output_file)
 
-    def run_normalization(self) -> None:
+    def _normalize_media_file(self, index: int, media_file: MediaFile) -> None:
         """
-        Run the normalization procedures
+        Run the normalization for a single media file
+
+        Args:
+            index (int): Index of the media file in the batch
+            media_file (MediaFile): The media file to normalize
         """
-        for index, media_file in enumerate(
-            tqdm(self.media_files, desc="File", disable=not self.progress, position=0)
-        ):
-            _logger.info(
-                f"Normalizing file {media_file} ({index + 1} of {self.file_count})"
-            )
+        _logger.info(
+            f"Normalizing file {media_file} ({index + 1} of {self.file_count})"
+        )
 
-            try:
-                media_file.run_normalization()
-            except Exception as e:
-                if len(self.media_files) > 1:
-                    # simply warn and do not die
-                    _logger.error(
-                        f"Error processing input file {media_file}, will "
-                        f"continue batch-processing. Error was: {e}"
-                    )
-                else:
-                    # raise the error so the program will exit
-                    raise e
+        try:
+            media_file.run_normalization()
+        except Exception as e:
+            if self._interrupted.is_set():
+                # ffmpeg was killed because the whole batch is aborted
+                raise
+            if len(self.media_files) > 1:
+                # simply warn and do not die
+                _logger.error(
+                    f"Error processing input file {media_file}, will "
+                    f"continue batch-processing. Error was: {e}"
+                )
+            else:
+                # raise the error so the program will exit
+                raise e
+
+        _logger.info(f"Normalized file written to {media_file.output_file}")
 
-            _logger.info(f"Normalized file written to {media_file.output_file}")
+    def run_normalization(self) -> None:
+        """
+        Run the normalization procedures
+        """
+        if self.jobs > 1 and len(self.media_files) > 1:
+            # ffmpeg does the heavy lifting in a subprocess, so threads are enough
+            # to keep several files in flight at once
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                futures = [
+                    executor.submit(self._normalize_media_file, index, media_file)
+                    for index, media_file in enumerate(self.media_files)
+                ]
+                try:
+                    for future in tqdm(
+                        as_completed(futures),
+                        total=len(futures),
+                        desc="File",
+                        disable=not self.progress,
+                        position=0,
+                    ):
+                        future.result()
+                except BaseException:
+                    # stop the batch instead of starting the queued files
+                    self._interrupted.set()
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise
+        else:
+            for index, media_file in enumerate(
+                tqdm(
+                    self.media_files, desc="File", disable=not self.progress, position=0
+                )
+            ):
+                self._normalize_media_file(index, media_file)
 
         if self.print_stats:
             json.dump(list(chain.from_iterable(media_file.get_stats() for media_file in self.media_files)), sys.stdout, indent=4)
@@ -18,7 +18,6 @@ class TqdmLoggingHandler(logging.StreamHandler):
     def emit(self, record: logging.LogRecord) -> None:
         try:
             msg = self.format(record)
-            set_mp_lock()
             tqdm.write(msg, file=sys.stderr)
             self.flush()
         except (KeyboardInterrupt, SystemExit):
@@ -62,6 +61,9 @@ def setup_cli_logger(arguments: argparse.Namespace) -> None:
     )
     logger.addHandler(handler)
 
+    # set the tqdm lock once, instead of creating a new lock for every log record
+    set_mp_lock()
+
     logger.setLevel(logging.WARNING)
 
     if arguments.quiet:
@@ -1,18 +1,21 @@
 from __future__ import annotations
 
+import errno
 import logging
 import os
 import re
 import shlex
 from shutil import move, rmtree
 from tempfile import mkdtemp
-from typing import TYPE_CHECKING, Iterable, Iterator, Literal, TypedDict
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Literal, TypedDict, cast
 
 from tqdm import tqdm
 
-from ._cmd_utils import DUR_REGEX, NUL, CommandRunner
+from ._cache import get_cache_key, load_cached_stats, save_cached_stats
+from ._cmd_utils import DUR_REGEX, CommandRunner
 from ._errors import FFmpegNormalizeError
 from ._streams import (
+    DYNAMIC_MODE_SAMPLE_RATE_WARNING,
     AudioStream,
     LoudnessStatisticsWithMetadata,
     SubtitleStream,
@@ -31,14 +34,19 @@ ONE_STREAM = {"aac", "ast", "flac", "mp3", "wav"}
 
 TQDM_BAR_FORMAT = "{desc}: {percentage:3.2f}% |{bar}{r_bar}"
 
+_stream_id_pattern = re.compile(r"#0:([\d]+)")
+_sample_rate_pattern = re.compile(r"(\d+) Hz")
+_bit_depth_pattern = re.compile(r"[sfu](\d+)(p|le|be)?")
 
-def _to_ms(**kwargs: str) -> int:
-    hour = int(kwargs.get("hour", 0))
-    minute = int(kwargs.get("min", 0))
-    sec = int(kwargs.get("sec", 0))
-    ms = int(kwargs.get("ms", 0))
+# the measured values the second pass loudnorm filter needs
+_EBU_FIRST_PASS_KEYS = ("input_i", "input_tp", "input_lra", "input_thresh", "target_offset")
 
-    return (hour * 60 * 60 * 1000) + (minute * 60 * 1000) + (sec * 1000) + ms
+
+def _to_ms(hour: str, minute: str, sec: str, frac: str) -> int:
+    # ffmpeg prints fractions of a second with two digits, i.e. centiseconds
+    ms = int(frac.ljust(3, "0")[:3])
+
+    return int(hour) * 3_600_000 + int(minute) * 60_000 + int(sec) * 1000 + ms
 
 
 class StreamDict(TypedDict):
@@ -52,6 +60,15 @@ class MediaFile:
     Class that holds a file, its streams and adjustments
     """
 
+    __slots__ = (
+        "ffmpeg_normalize",
+        "skip",
+        "input_file",
+        "output_file",
+        "output_ext",
+        "streams",
+    )
+
     def __init__(
         self, ffmpeg_normalize: FFmpegNormalize, input_file: str, output_file: str
     ):
@@ -109,7 +126,7 @@ class MediaFile:
             "0",
             "-f",
             "null",
-            NUL,
+            "-",
         ]
 
         output = CommandRunner().run_command(cmd).get_output()
@@ -123,7 +140,7 @@ class MediaFile:
         for line in output_lines:
             if "Duration" in line:
                 if duration_search := DUR_REGEX.search(line):
-                    duration = _to_ms(**duration_search.groupdict()) / 1000
+                    duration = _to_ms(*duration_search.groups()) / 1000
                     _logger.debug(f"Found duration: {duration} s")
                 else:
                     _logger.warning("Could not extract duration from input file!")
@@ -131,7 +148,7 @@ class MediaFile:
             if not line.startswith("Stream"):
                 continue
 
-            if stream_id_match := re.search(r"#0:([\d]+)", line):
+            if stream_id_match := _stream_id_pattern.search(line):
                 stream_id = int(stream_id_match.group(1))
                 if stream_id in self._stream_ids():
                     continue
@@ -140,11 +157,11 @@ class MediaFile:
 
             if "Audio" in line:
                 _logger.debug(f"Found audio stream at index {stream_id}")
-                sample_rate_match = re.search(r"(\d+) Hz", line)
+                sample_rate_match = _sample_rate_pattern.search(line)
                 sample_rate = (
                     int(sample_rate_match.group(1)) if sample_rate_match else None
                 )
-                bit_depth_match = re.search(r"[sfu](\d+)(p|le|be)?", line)
+                bit_depth_match = _bit_depth_pattern.search(line)
                 bit_depth = int(bit_depth_match.group(1)) if bit_depth_match else None
                 self.streams["audio"][stream_id] = AudioStream(
                     self.ffmpeg_normalize,
@@ -191,11 +208,27 @@ class MediaFile:
         """
         _logger.debug(f"Running normalization for {self.input_file}")
 
-        # run the first pass to get loudness stats
-        self._first_pass()
+        # run the first pass to get loudness stats for all streams at once,
+        # unless loudnorm should measure and normalize in one go
+        if self.ffmpeg_normalize.single_pass:
+            _logger.debug("Single pass mode, skipping first pass")
+            if not self.ffmpeg_normalize.sample_rate:
+                _logger.warning(DYNAMIC_MODE_SAMPLE_RATE_WARNING)
+        elif self._show_progress():
+            with tqdm(
+                total=100,
+                position=1,
+                desc="First Pass",
+                bar_format=TQDM_BAR_FORMAT,
+            ) as pbar:
+                for progress in self._first_pass():
+                    pbar.update(progress - pbar.n)
+        else:
+            for _ in self._first_pass():
+                pass
 
         # run the second pass as a whole
-        if self.ffmpeg_normalize.progress:
+        if self._show_progress():
             with tqdm(
                 total=100,
                 position=1,
@@ -208,6 +241,18 @@ class MediaFile:
             for _ in self._second_pass():
                 pass
 
+    def _show_progress(self) -> bool:
+        """
+        Determine whether per-stream progress bars should be shown.
+
+        Returns:
+            bool: True if progress should be shown, False otherwise
+        """
+        # when files are processed in parallel, their bars would overlap
+        return self.ffmpeg_normalize.progress and not (
+            self.ffmpeg_normalize.jobs > 1 and self.ffmpeg_normalize.file_count > 1
+        )
+
     def _can_write_output_video(self) -> bool:
         """
         Determine whether the output file can contain video at all.
@@ -220,30 +265,151 @@ class MediaFile:
 
         return not self.ffmpeg_normalize.video_disable
 
-    def _first_pass(self) -> None:
+    def _first_pass(self) -> Iterator[float]:
         """
         Run the first pass of the normalization process.
+
+        All audio streams are measured in a single ffmpeg call, so that the input
+        only has to be read and decoded once.
+        """
+        _logger.info(f"Running first pass for {self.input_file}")
+
+        if not self.streams["audio"]:
+            return
+
+        filter_complex, output_labels = self._get_first_pass_filter_cmd()
+
+        cache_key = None
+        if self.ffmpeg_normalize.cache:
+            # an updated ffmpeg at the same path may measure differently
+            cache_key = get_cache_key(
+                self.input_file,
+                filter_complex,
+                depends_on=[self.ffmpeg_normalize.ffmpeg_exe],
+            )
+            if cache_key is not None:
+                cached_stats = load_cached_stats(cache_key)
+                if self._is_valid_first_pass_stats(cached_stats):
+                    _logger.info(
+                        f"Using cached first pass statistics for {self.input_file}"
+                    )
+                    self._set_first_pass_stats(cast(list, cached_stats))
+                    yield 100
+                    return
+
+        cmd = [
+            self.ffmpeg_normalize.ffmpeg_exe,
+            "-hide_banner",
+            "-y",
+            "-i",
+            self.input_file,
+            "-filter_complex",
+            filter_complex,
+        ]
+        for output_label in output_labels:
+            cmd.extend(["-map", output_label])
+        cmd.extend(["-vn", "-sn", "-f", "null", "-"])
+
+        cmd_runner = CommandRunner()
+        yield from cmd_runner.run_ffmpeg_command(cmd)
+        # the output is already logged by the command runner in debug mode
+        output = cmd_runner.get_output()
+
+        first_pass_stats = self._parse_first_pass_output(output)
+        self._set_first_pass_stats(first_pass_stats)
+
+        if cache_key is not None:
+            save_cached_stats(cache_key, first_pass_stats)
+
+    def _get_first_pass_filter_cmd(self) -> tuple[str, list[str]]:
+        """
+        Return the first pass filter command that measures all audio streams at once.
+
+        Returns:
+            tuple[str, list[str]]: filter_complex command and the required output labels
         """
-        _logger.debug(f"Parsing normalization info for {self.input_file}")
+        filter_chains = []
+        output_labels = []
+        for audio_stream in self.streams["audio"].values():
+            output_label = f"[pass1_{audio_stream.stream_id}]"
+            output_labels.append(output_label)
+            filter_chains.append(audio_stream.get_first_pass_filter() + output_label)
+
+        return ";".join(filter_chains), output_labels
 
-        for index, audio_stream in enumerate(self.streams["audio"].values()):
+    def _parse_first_pass_output(self, output: str) -> list[Any]:
+        """
+        Parse the statistics of all audio streams from the first pass output.
+
+        Args:
+            output (str): Output from ffmpeg
+
+        Returns:
+            list: The EBU loudness statistics, or the mean and max volume, in stream order
+
+        Raises:
+            FFmpegNormalizeError: If the statistics of some stream are missing
+        """
+        # the filter indices follow the order of the filter chains, and therefore the order of the streams
+        if self.ffmpeg_normalize.normalization_type == "ebu":
+            all_ebu_stats = AudioStream.prune_and_parse_loudnorm_output(output)
+            if len(all_ebu_stats) != len(self.streams["audio"]):
+                raise FFmpegNormalizeError(
+                    f"Could not get loudness statistics for {self.input_file}"
+                )
+            return [
+                all_ebu_stats[filter_index] for filter_index in sorted(all_ebu_stats)
+            ]
+
+        all_astats = AudioStream.parse_astats_output(output)
+        if len(all_astats) != len(self.streams["audio"]):
+            raise FFmpegNormalizeError(
+                f"Could not get mean and max volume for {self.input_file}"
+            )
+        return [all_astats[filter_index] for filter_index in sorted(all_astats)]
+
+    def _is_valid_first_pass_stats(self, first_pass_stats: Any) -> bool:
+        """
+        Check that (cached) first pass statistics can be used for the audio streams.
+
+        Args:
+            first_pass_stats (Any): The statistics as loaded from the cache
+
+        Returns:
+            bool: True if there are usable statistics for every audio stream, False otherwise
+        """
+        if not isinstance(first_pass_stats, list) or len(first_pass_stats) != len(
+            self.streams["audio"]
+        ):
+            return False
+
+        def is_number(value: Any) -> bool:
+            return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+        if self.ffmpeg_normalize.normalization_type == "ebu":
+            return all(
+                isinstance(stats, dict)
+                and all(is_number(stats.get(key)) for key in _EBU_FIRST_PASS_KEYS)
+                for stats in first_pass_stats
+            )
+
+        return all(
+            isinstance(stats, list) and len(stats) == 2 and all(map(is_number, stats))
+            for stats in first_pass_stats
+        )
+
+    def _set_first_pass_stats(self, first_pass_stats: list[Any]) -> None:
+        """
+        Set the first pass statistics of all audio streams.
+
+        Args:
+            first_pass_stats (list): The EBU loudness statistics, or the mean and max volume, in stream order
+        """
+        for audio_stream, stats in zip(self.streams["audio"].values(), first_pass_stats):
             if self.ffmpeg_normalize.normalization_type == "ebu":
-                fun = getattr(audio_stream, "parse_loudnorm_stats")
+                audio_stream.set_first_pass_stats(stats)
             else:
-                fun = getattr(audio_stream, "parse_astats")
-
-            if self.ffmpeg_normalize.progress:
-                with tqdm(
-                    total=100,
-                    position=1,
-                    desc=f"Stream {index + 1}/{len(self.streams['audio'].values())}",
-                    bar_format=TQDM_BAR_FORMAT,
-                ) as pbar:
-                    for progress in fun():
-                        pbar.update(progress - pbar.n)
-            else:
-                for _ in fun():
-                    pass
+                audio_stream.set_astats(*stats)
 
     def _get_audio_filter_cmd(self) -> tuple[str, list[str]]:
         """
@@ -286,7 +452,9 @@ class MediaFile:
                 )
                 normalization_filter = "acopy"
             else:
-                if self.ffmpeg_normalize.normalization_type == "ebu":
+                if self.ffmpeg_normalize.single_pass:
+                    normalization_filter = audio_stream.get_single_pass_opts_ebu()
+                elif self.ffmpeg_normalize.normalization_type == "ebu":
                     normalization_filter = audio_stream.get_second_pass_opts_ebu()
                 else:
                     normalization_filter = audio_stream.get_second_pass_opts_peakrms()
@@ -441,11 +609,16 @@ class MediaFile:
                 _logger.debug(
                     f"Moving temporary file from {temp_file} to {self.output_file}"
                 )
-                move(temp_file, self.output_file)
-                rmtree(temp_dir, ignore_errors=True)
-        except Exception as e:
+                try:
+                    os.replace(temp_file, self.output_file)
+                except OSError as e:
+                    # the temporary directory may be on another file system
+                    if e.errno != errno.EXDEV:
+                        raise
+                    move(temp_file, self.output_file)
+        finally:
+            # also clean up when interrupted
             rmtree(temp_dir, ignore_errors=True)
-            raise e
 
         output = cmd_runner.get_output()
         # in the second pass, we do not normalize stream-by-stream, so we set the stats based on the
@@ -4,9 +4,9 @@ import json
 import logging
 import os
 import re
-from typing import TYPE_CHECKING, Iterator, List, Literal, Optional, TypedDict, cast
+from typing import TYPE_CHECKING, Any, List, Literal, Optional, TypedDict, cast
 
-from ._cmd_utils import NUL, CommandRunner, dict_to_filter_opts
+from ._cmd_utils import CommandRunner, dict_to_filter_opts
 from ._errors import FFmpegNormalizeError
 
 if TYPE_CHECKING:
@@ -16,6 +16,15 @@ if TYPE_CHECKING:
 _logger = logging.getLogger(__name__)
 
 _loudnorm_pattern = re.compile(r"\[Parsed_loudnorm_(\d+)")
+_astats_pattern = re.compile(
+    r"\[Parsed_astats_(\d+) @ [^\]]+\] (RMS|Peak) level dB: ([\-\d\.]+)"
+)
+
+DYNAMIC_MODE_SAMPLE_RATE_WARNING = (
+    "In dynamic mode, the sample rate will automatically be set to 192 kHz by the loudnorm filter. "
+    "Specify -ar/--sample-rate to override it."
+)
+
 
 class EbuLoudnessStatistics(TypedDict):
     input_i: float
@@ -44,6 +53,8 @@ class LoudnessStatisticsWithMetadata(LoudnessStatistics):
 
 
 class MediaStream:
+    __slots__ = ("ffmpeg_normalize", "media_file", "stream_type", "stream_id")
+
     def __init__(
         self,
         ffmpeg_normalize: FFmpegNormalize,
@@ -73,6 +84,8 @@ class MediaStream:
 
 
 class VideoStream(MediaStream):
+    __slots__ = ()
+
     def __init__(
         self, ffmpeg_normalize: FFmpegNormalize, media_file: MediaFile, stream_id: int
     ):
@@ -80,6 +93,8 @@ class VideoStream(MediaStream):
 
 
 class SubtitleStream(MediaStream):
+    __slots__ = ()
+
     def __init__(
         self, ffmpeg_normalize: FFmpegNormalize, media_file: MediaFile, stream_id: int
     ):
@@ -87,6 +102,8 @@ class SubtitleStream(MediaStream):
 
 
 class AudioStream(MediaStream):
+    __slots__ = ("loudness_statistics", "sample_rate", "bit_depth", "duration")
+
     def __init__(
         self,
         ffmpeg_normalize: FFmpegNormalize,
@@ -208,121 +225,97 @@ class AudioStream(MediaStream):
         """
         input_label = f"[0:{self.stream_id}]"
         filter_chain = []
-        if self.media_file.ffmpeg_normalize.pre_filter:
-            filter_chain.append(self.media_file.ffmpeg_normalize.pre_filter)
+        if self.ffmpeg_normalize.pre_filter:
+            filter_chain.append(self.ffmpeg_normalize.pre_filter)
         filter_chain.append(current_filter)
         filter_str = input_label + ",".join(filter_chain)
         return filter_str
 
-    def parse_astats(self) -> Iterator[float]:
+    def _get_loudnorm_target_opts(self) -> dict[str, Any]:
         """
-        Use ffmpeg with astats filter to get the mean (RMS) and max (peak) volume of the input file.
+        Get the loudnorm filter options that only depend on the user-specified targets.
 
-        Yields:
-            float: The progress of the command.
+        Returns:
+            dict: The loudnorm filter options.
         """
-        _logger.info(f"Running first pass astats filter for stream {self.stream_id}")
+        opts: dict[str, Any] = {
+            "i": self.ffmpeg_normalize.target_level,
+            "lra": self.ffmpeg_normalize.loudness_range_target,
+            "tp": self.ffmpeg_normalize.true_peak,
+            "offset": self.ffmpeg_normalize.offset,
+            "print_format": "json",
+        }
 
-        filter_str = self._get_filter_str_with_pre_filter(
-            "astats=measure_overall=Peak_level+RMS_level:measure_perchannel=0"
-        )
+        if self.ffmpeg_normalize.dual_mono:
+            opts["dual_mono"] = "true"
 
-        cmd = [
-            self.media_file.ffmpeg_normalize.ffmpeg_exe,
-            "-hide_banner",
-            "-y",
-            "-i",
-            self.media_file.input_file,
-            "-filter_complex",
-            filter_str,
-            "-vn",
-            "-sn",
-            "-f",
-            "null",
-            NUL,
-        ]
-
-        cmd_runner = CommandRunner()
-        yield from cmd_runner.run_ffmpeg_command(cmd)
-        output = cmd_runner.get_output()
-
-        _logger.debug(
-            f"astats command output: {CommandRunner.prune_ffmpeg_progress_from_output(output)}"
-        )
+        return opts
 
-        mean_volume_matches = re.findall(r"RMS level dB: ([\-\d\.]+)", output)
-        if mean_volume_matches:
-            if mean_volume_matches[0] == "-":
-                self.loudness_statistics["mean"] = float("-inf")
-            else:
-                self.loudness_statistics["mean"] = float(mean_volume_matches[0])
-        else:
-            raise FFmpegNormalizeError(
-                f"Could not get mean volume for {self.media_file.input_file}"
-            )
+    def get_first_pass_filter(self) -> str:
+        """
+        Get the filter string used to measure this stream in the first pass.
+        Depending on the normalization type, this is either a loudnorm or an astats filter.
 
-        max_volume_matches = re.findall(r"Peak level dB: ([\-\d\.]+)", output)
-        if max_volume_matches:
-            if max_volume_matches[0] == "-":
-                self.loudness_statistics["max"] = float("-inf")
-            else:
-                self.loudness_statistics["max"] = float(max_volume_matches[0])
+        Returns:
+            str: The filter string, including the input label.
+        """
+        if self.ffmpeg_normalize.normalization_type == "ebu":
+            current_filter = "loudnorm=" + dict_to_filter_opts(
+                self._get_loudnorm_target_opts()
+            )
         else:
-            raise FFmpegNormalizeError(
-                f"Could not get max volume for {self.media_file.input_file}"
+            current_filter = (
+                "astats=measure_overall=Peak_level+RMS_level:measure_perchannel=0"
             )
 
-    def parse_loudnorm_stats(self) -> Iterator[float]:
+        return self._get_filter_str_with_pre_filter(current_filter)
+
+    def set_first_pass_stats(self, stats: EbuLoudnessStatistics) -> None:
         """
-        Run a first pass loudnorm filter to get measured data.
+        Set the EBU loudness statistics for the first pass.
 
-        Yields:
-            float: The progress of the command.
+        Args:
+            stats (dict): The EBU loudness statistics.
         """
-        _logger.info(f"Running first pass loudnorm filter for stream {self.stream_id}")
+        self.loudness_statistics["ebu_pass1"] = stats
 
-        opts = {
-            "i": self.media_file.ffmpeg_normalize.target_level,
-            "lra": self.media_file.ffmpeg_normalize.loudness_range_target,
-            "tp": self.media_file.ffmpeg_normalize.true_peak,
-            "offset": self.media_file.ffmpeg_normalize.offset,
-            "print_format": "json",
-        }
+    def set_astats(self, mean_volume: float, max_volume: float) -> None:
+        """
+        Set the mean (RMS) and max (peak) volume measured in the first pass.
 
-        if self.media_file.ffmpeg_normalize.dual_mono:
-            opts["dual_mono"] = "true"
+        Args:
+            mean_volume (float): The mean (RMS) volume in dB.
+            max_volume (float): The max (peak) volume in dB.
+        """
+        self.loudness_statistics["mean"] = mean_volume
+        self.loudness_statistics["max"] = max_volume
 
-        filter_str = self._get_filter_str_with_pre_filter(
-            "loudnorm=" + dict_to_filter_opts(opts)
-        )
+    @staticmethod
+    def parse_astats_output(output: str) -> dict[int, tuple[float, float]]:
+        """
+        Parse the output of one or more astats filters.
+        There may be multiple outputs if multiple streams were processed.
 
-        cmd = [
-            self.media_file.ffmpeg_normalize.ffmpeg_exe,
-            "-hide_banner",
-            "-y",
-            "-i",
-            self.media_file.input_file,
-            "-map",
-            f"0:{self.stream_id}",
-            "-filter_complex",
-            filter_str,
-            "-vn",
-            "-sn",
-            "-f",
-            "null",
-            NUL,
-        ]
-
-        cmd_runner = CommandRunner()
-        yield from cmd_runner.run_ffmpeg_command(cmd)
-        output = cmd_runner.get_output()
-
-        _logger.debug(
-            f"Loudnorm first pass command output: {CommandRunner.prune_ffmpeg_progress_from_output(output)}"
-        )
+        Args:
+            output (str): The output from ffmpeg.
+
+        Returns:
+            dict: The mean (RMS) and max (peak) volume, keyed by the index of the astats filter.
+        """
+        mean_volumes: dict[int, float] = {}
+        max_volumes: dict[int, float] = {}
+        for filter_index, measurement, value in _astats_pattern.findall(output):
+            volume = float("-inf") if value == "-" else float(value)
+            if measurement == "RMS":
+                mean_volumes.setdefault(int(filter_index), volume)
+            else:
+                max_volumes.setdefault(int(filter_index), volume)
 
-        # only one stream
-        self.loudness_statistics["ebu_pass1"] = next(iter(AudioStream.prune_and_parse_loudnorm_output(output).values()))
+        return {
+            filter_index: (mean_volumes[filter_index], max_volumes[filter_index])
+            for filter_index in mean_volumes
+            if filter_index in max_volumes
+        }
 
     @staticmethod
     def prune_and_parse_loudnorm_output(
@@ -418,7 +411,7 @@ class AudioStream(MediaStream):
 
         if not self.loudness_statistics["ebu_pass1"]:
             raise FFmpegNormalizeError(
-                "First pass not run, you must call parse_loudnorm_stats first"
+                "First pass not run, no loudness statistics to normalize to"
             )
 
         if float(self.loudness_statistics["ebu_pass1"]["input_i"]) > 0:
@@ -428,9 +421,13 @@ class AudioStream(MediaStream):
             )
             self.loudness_statistics["ebu_pass1"]["input_i"] = 0
 
-        will_use_dynamic_mode = self.media_file.ffmpeg_normalize.dynamic
+        will_use_dynamic_mode = self.ffmpeg_normalize.dynamic
 
-        if self.media_file.ffmpeg_normalize.keep_loudness_range_target:
+        # keep the adjusted value local to this stream, since the settings object
+        # is shared by all files (which may be normalized concurrently)
+        loudness_range_target = self.ffmpeg_normalize.loudness_range_target
+
+        if self.ffmpeg_normalize.keep_loudness_range_target:
             _logger.debug(
                 "Keeping target loudness range in second pass loudnorm filter"
             )
@@ -441,34 +438,34 @@ class AudioStream(MediaStream):
                     f"({input_lra}), capping to allowed range"
                 )
 
-            self.media_file.ffmpeg_normalize.loudness_range_target = self._constrain(
+            loudness_range_target = self._constrain(
                 self.loudness_statistics["ebu_pass1"]["input_lra"], 1, 50
             )
 
-        if self.media_file.ffmpeg_normalize.keep_lra_above_loudness_range_target:
+        if self.ffmpeg_normalize.keep_lra_above_loudness_range_target:
             if (
                 self.loudness_statistics["ebu_pass1"]["input_lra"]
-                <= self.media_file.ffmpeg_normalize.loudness_range_target
+                <= loudness_range_target
             ):
                 _logger.debug(
                     "Setting loudness range target in second pass loudnorm filter"
                 )
             else:
-                self.media_file.ffmpeg_normalize.loudness_range_target = (
-                    self.loudness_statistics["ebu_pass1"]["input_lra"]
-                )
+                loudness_range_target = self.loudness_statistics["ebu_pass1"][
+                    "input_lra"
+                ]
                 _logger.debug(
                     "Keeping target loudness range in second pass loudnorm filter"
                 )
 
         if (
-            self.media_file.ffmpeg_normalize.loudness_range_target
+            loudness_range_target
             < self.loudness_statistics["ebu_pass1"]["input_lra"]
             and not will_use_dynamic_mode
         ):
             _logger.warning(
                 f"Input file had loudness range of {self.loudness_statistics['ebu_pass1']['input_lra']}. "
-                f"This is larger than the loudness range target ({self.media_file.ffmpeg_normalize.loudness_range_target}). "
+                f"This is larger than the loudness range target ({loudness_range_target}). "
                 "Normalization will revert to dynamic mode. Choose a higher target loudness range if you want linear normalization. "
                 "Alternatively, use the --keep-loudness-range-target or --keep-lra-above-loudness-range-target option to keep the target loudness range from "
                 "the input."
@@ -476,10 +473,7 @@ class AudioStream(MediaStream):
             will_use_dynamic_mode = True
 
         if will_use_dynamic_mode and not self.ffmpeg_normalize.sample_rate:
-            _logger.warning(
-                "In dynamic mode, the sample rate will automatically be set to 192 kHz by the loudnorm filter. "
-                "Specify -ar/--sample-rate to override it."
-            )
+            _logger.warning(DYNAMIC_MODE_SAMPLE_RATE_WARNING)
 
         target_level = self.ffmpeg_normalize.target_level
         if self.ffmpeg_normalize.auto_lower_loudness_target:
@@ -499,8 +493,8 @@ class AudioStream(MediaStream):
 
         opts = {
             "i": target_level,
-            "lra": self.media_file.ffmpeg_normalize.loudness_range_target,
-            "tp": self.media_file.ffmpeg_normalize.true_peak,
+            "lra": loudness_range_target,
+            "tp": self.ffmpeg_normalize.true_peak,
             "offset": self._constrain(
                 stats["target_offset"], -99, 99, name="target_offset"
             ),
@@ -516,15 +510,28 @@ class AudioStream(MediaStream):
             "measured_thresh": self._constrain(
                 stats["input_thresh"], -99, 0, name="input_thresh"
             ),
-            "linear": "false" if self.media_file.ffmpeg_normalize.dynamic else "true",
+            "linear": "false" if self.ffmpeg_normalize.dynamic else "true",
             "print_format": "json",
         }
 
-        if self.media_file.ffmpeg_normalize.dual_mono:
+        if self.ffmpeg_normalize.dual_mono:
             opts["dual_mono"] = "true"
 
         return "loudnorm=" + dict_to_filter_opts(opts)
 
+    def get_single_pass_opts_ebu(self) -> str:
+        """
+        Return single pass loudnorm filter options string for ffmpeg.
+        Without measured values from a first pass, loudnorm can only normalize dynamically.
+
+        Returns:
+            str: ffmpeg loudnorm filter string
+        """
+        opts = self._get_loudnorm_target_opts()
+        opts["linear"] = "false"
+
+        return "loudnorm=" + dict_to_filter_opts(opts)
+
     def get_second_pass_opts_peakrms(self) -> str:
         """
         Set the adjustment gain based on chosen option and mean/max volume,
@@ -541,8 +548,8 @@ class AudioStream(MediaStream):
                 "First pass not run, no mean/max volume to normalize to"
             )
 
-        normalization_type = self.media_file.ffmpeg_normalize.normalization_type
-        target_level = self.media_file.ffmpeg_normalize.target_level
+        normalization_type = self.ffmpeg_normalize.normalization_type
+        target_level = self.ffmpeg_normalize.target_level
 
         if normalization_type == "peak":
             adjustment = 0 + target_level - self.loudness_statistics["max"]
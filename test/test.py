@@ -10,6 +10,8 @@ import pytest
 
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
 
+from ffmpeg_normalize._media_file import _to_ms  # noqa: E402
+
 
 def ffmpeg_normalize_call(args: List[str]) -> Tuple[str, str]:
     cmd = [sys.executable, "-m", "ffmpeg_normalize"]
@@ -171,6 +173,47 @@ class TestFFmpegNormalize:
         assert os.path.isfile("normalized/test1.mkv")
         assert os.path.isfile("normalized/test2.mkv")
 
+    def test_duplicate_inputs(self):
+        _, stderr = ffmpeg_normalize_call(["test/test.mp4", "test/test.mp4"])
+        assert os.path.isfile("normalized/test.mkv")
+        assert "was already given" in stderr
+
+    def test_jobs(self):
+        os.makedirs("normalized", exist_ok=True)
+        ffmpeg_normalize_call(
+            [
+                "test/test.mp4",
+                "test/test.mp4",
+                "-o",
+                "normalized/test1.mkv",
+                "normalized/test2.mkv",
+                "-j",
+                "2",
+            ]
+        )
+        assert os.path.isfile("normalized/test1.mkv")
+        assert os.path.isfile("normalized/test2.mkv")
+
+    def test_jobs_fail(self):
+        _, stderr = ffmpeg_normalize_call(["test/test.mp4", "-j", "0"])
+        assert "must be a positive integer" in stderr
+
+    def test_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        args = ["test/test.mp4", "-n", "--print-stats", "--cache", "-v"]
+        stdout_first, _ = ffmpeg_normalize_call(args)
+        assert os.listdir(tmp_path / "ffmpeg-normalize")
+        stdout_second, stderr_second = ffmpeg_normalize_call(args)
+        assert "Using cached first pass statistics" in stderr_second
+        assert json.loads(stdout_first) == json.loads(stdout_second)
+
+        # malformed entries are measured again instead of being used
+        for cache_file in (tmp_path / "ffmpeg-normalize").iterdir():
+            cache_file.write_text("[{}]")
+        stdout_third, stderr_third = ffmpeg_normalize_call(args)
+        assert "Using cached first pass statistics" not in stderr_third
+        assert json.loads(stdout_first) == json.loads(stdout_third)
+
     def test_overwrites(self):
         ffmpeg_normalize_call(["test/test.mp4", "-v"])
         _, stderr = ffmpeg_normalize_call(["test/test.mp4", "-v"])
@@ -290,6 +333,23 @@ class TestFFmpegNormalize:
             ],
         )
 
+    def test_single_pass(self):
+        _, stderr = ffmpeg_normalize_call(["test/test.mp4", "--single-pass", "-v"])
+        assert os.path.isfile("normalized/test.mkv")
+        assert "Running first pass" not in stderr
+        assert "Running second pass" in stderr
+
+    def test_single_pass_fail(self):
+        _, stderr = ffmpeg_normalize_call(
+            ["test/test.mp4", "--single-pass", "--lower-only"]
+        )
+        assert "cannot be combined" in stderr
+
+        _, stderr = ffmpeg_normalize_call(
+            ["test/test.mp4", "--single-pass", "-nt", "rms"]
+        )
+        assert "only supported for EBU normalization" in stderr
+
     def test_acodec(self):
         ffmpeg_normalize_call(["test/test.mp4", "-c:a", "aac"])
         assert os.path.isfile("normalized/test.mkv")
@@ -377,6 +437,11 @@ class TestFFmpegNormalize:
         assert "100/100" in stderr or "100%" in stderr
         assert os.path.isfile("normalized/test.mkv")
 
+    def test_to_ms(self):
+        # ffmpeg prints centiseconds
+        assert _to_ms("00", "00", "01", "12") == 1120
+        assert _to_ms("01", "02", "03", "123") == 3_723_123
+
     def test_duration(self):
         _, stderr = ffmpeg_normalize_call(["test/test.wav", "--debug"])
         assert "Found duration: " in stderr